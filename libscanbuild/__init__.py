@@ -16,12 +16,16 @@ import subprocess
 import sys
 import pprint
 
-from typing import List, Any, Dict, Callable  # noqa: ignore=F401
+from typing import List, Any, Dict, Callable, Iterator  # noqa: ignore=F401
 
 ENVIRONMENT_KEY = 'INTERCEPT_BUILD'
 
 Execution = collections.namedtuple('Execution', ['pid', 'cwd', 'cmd'])
 
+# Logging levels indexed by the number of `-v` flags. (More flags than the
+# number of entries are getting the last one.)
+LOGGING_LEVELS = (logging.WARNING, logging.INFO, logging.DEBUG, logging.NOTSET)
+
 
 def shell_split(string):
     # type: (str) -> List[str]
@@ -81,6 +85,53 @@ def run_command(command, cwd=None):
         raise ex
 
 
+def load_json(filename):
+    # type: (str) -> Any
+    """ Read and parse the given JSON file.
+
+    When the `orjson` package is installed it's used to parse the file,
+    because it's much faster on big files (like a compilation database).
+    Otherwise it falls back to the standard `json` module.
+
+    :param filename: the file to read from
+    :return: the parsed content of the file """
+
+    # imported here to not slow down the compiler wrappers, which are
+    # importing this module but never read big JSON files.
+    try:
+        import orjson  # type: ignore
+    except ImportError:
+        with open(filename, 'r') as handle:
+            return json.load(handle)
+    with open(filename, 'rb') as handle:
+        return orjson.loads(handle.read())
+
+
+def iter_json_array(filename):
+    # type: (str) -> Iterator[Any]
+    """ Iterate over the elements of a JSON array file.
+
+    When the `ijson` package is installed with its C backend, the file is
+    parsed incrementally, and only the current element is kept in memory.
+    Otherwise the whole file is parsed by `load_json`.
+
+    :param filename: the file to read from
+    :return: stream of the array elements """
+
+    try:
+        import ijson  # type: ignore
+    except ImportError:
+        ijson = None  # type: ignore
+    # the pure python backends are much slower than loading the whole file
+    if getattr(ijson, 'backend', None) != 'yajl2_c':
+        for element in load_json(filename):
+            yield element
+        return
+    with open(filename, 'rb') as handle:
+        for element in ijson.items(handle, 'item'):
+            yield element
+
+
 def reconfigure_logging(verbose_level):
     """ Reconfigure logging level and format based on the verbose flag.
 
@@ -93,8 +144,7 @@ def reconfigure_logging(verbose_level):
 
     root = logging.getLogger()
     # tune level
-    level = logging.WARNING - min(logging.WARNING, (10 * verbose_level))
-    root.setLevel(level)
+    root.setLevel(LOGGING_LEVELS[min(verbose_level, len(LOGGING_LEVELS) - 1)])
     # be verbose with messages
     if verbose_level <= 3:
         fmt_string = '%(name)s: %(levelname)s: %(message)s'
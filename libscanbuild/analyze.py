@@ -16,13 +16,13 @@ import os
 import os.path
 import json
 import logging
-import multiprocessing
 import tempfile
 import functools
 import subprocess
 import platform
 import contextlib
 import datetime
+import errno
 import argparse  # noqa: ignore=F401
 from typing import Any, Dict, List, Callable, Iterable, Generator  # noqa: ignore=F401
 
@@ -30,13 +30,15 @@ from libscanbuild import command_entry_point, wrapper_entry_point, \
     wrapper_environment, run_build, run_command
 from libscanbuild.arguments import parse_args_for_scan_build, \
     parse_args_for_analyze_build
-from libscanbuild.intercept import capture
-from libscanbuild.report import document
 from libscanbuild.compilation import Compilation, classify_source, \
     CompilationDatabase
 from libscanbuild.clang import get_version, get_arguments
 from libscanbuild import Execution  # noqa: ignore=F401
 
+# The compiler wrappers are importing this module for every compilation, so
+# modules needed only by the scan-build and analyze-build commands (like the
+# report generation or the process pool) are imported by their users.
+
 __all__ = ['scan_build', 'analyze_build', 'analyze_compiler_wrapper']
 
 COMPILER_WRAPPER_CC = 'analyze-cc'
@@ -49,6 +51,9 @@ def scan_build():
     # type: () -> int
     """ Entry point for scan-build command. """
 
+    from libscanbuild.intercept import capture
+    from libscanbuild.report import document
+
     args = parse_args_for_scan_build()
     # will re-assign the report directory as new output
     with report_directory(args.output, args.keep_empty) as args.output:
@@ -77,14 +82,17 @@ def analyze_build():
     # type: () -> int
     """ Entry point for analyze-build command. """
 
+    from libscanbuild.report import document
+
     args = parse_args_for_analyze_build()
     # will re-assign the report directory as new output
     with report_directory(args.output, args.keep_empty) as args.output:
-        # run the analyzer against a compilation db
-        compilations = CompilationDatabase.load(args.cdb)
+        # run the analyzer against a compilation db. the entries are kept,
+        # because the report generation needs them too.
+        compilations = list(CompilationDatabase.load(args.cdb))
         run_analyzer_parallel(compilations, args)
         # cover report generation and bug counting
-        number_of_bugs = document(args)
+        number_of_bugs = document(args, compilations)
         # set exit status as it was requested
         return number_of_bugs if args.status_bugs else 0
 
@@ -117,7 +125,7 @@ def analyze_parameters(args):
 
         eg.: prefix_with(0, [1,2,3]) creates [0, 1, 0, 2, 0, 3] """
 
-        return [elem for piece in pieces for elem in [constant, piece]]
+        return [elem for piece in pieces for elem in (constant, piece)]
 
     def direct_args(args):
         # type: (argparse.Namespace) -> List[str]
@@ -172,16 +180,55 @@ def run_analyzer_parallel(compilations, args):
     # type: (Iterable[Compilation], argparse.Namespace) -> None
     """ Runs the analyzer against the given compilations. """
 
+    import multiprocessing
+
     logging.debug('run analyzer against compilation database')
     consts = analyze_parameters(args)
-    parameters = (dict(compilation.as_dict(), **consts)
-                  for compilation in compilations)
-    # when verbose output requested execute sequentially
-    pool = multiprocessing.Pool(1 if args.verbose > 2 else None)
-    for current in pool.imap_unordered(run, parameters):
-        logging_analyzer_output(current)
-    pool.close()
-    pool.join()
+    # the constant parameters are sent once to each worker, only the
+    # compilations are sent as tasks.
+    parameters = [compilation.as_dict() for compilation in compilations]
+    # when verbose output requested execute sequentially. the analyzer still
+    # runs in a worker process, so this process prints the output of one
+    # compilation while the next one is analyzed.
+    sequential = args.verbose > 2
+    processes = 1 if sequential else multiprocessing.cpu_count()
+    pool = multiprocessing.Pool(processes,
+                                initializer=initialize_worker,
+                                initargs=(consts,))
+    # the tasks are sent one by one. an analyzer run takes seconds, while
+    # sending a task takes microseconds, so batching would save nothing. but
+    # a batch would hold back the outputs till the whole batch is done, and
+    # could keep a worker busy at the end while the others are idle.
+    # (sequential run keeps the order of the compilations too.)
+    imap = pool.imap if sequential else pool.imap_unordered
+    try:
+        for current in imap(run_in_worker, parameters):
+            logging_analyzer_output(current)
+        pool.close()
+    except BaseException:
+        pool.terminate()
+        raise
+    finally:
+        pool.join()
+
+
+# The analyzer parameters which are the same for all compilations. Those are
+# set by the pool initializer in each worker process.
+WORKER_PARAMETERS = dict()  # type: Dict[str, Any]
+
+
+def initialize_worker(parameters):
+    # type: (Dict[str, Any]) -> None
+    """ Pool initializer to receive the constant analyzer parameters. """
+
+    WORKER_PARAMETERS.update(parameters)
+
+
+def run_in_worker(compilation):
+    # type: (Dict[str, Any]) -> Dict[str, Any]
+    """ Runs the analyzer against a single compilation in a pool worker. """
+
+    return run(dict(compilation, **WORKER_PARAMETERS))
 
 
 def setup_environment(args):
@@ -235,8 +282,13 @@ def report_directory(hint, keep):
     stamp_format = 'scan-build-%Y-%m-%d-%H-%M-%S-%f-'
     stamp = datetime.datetime.now().strftime(stamp_format)
     parent_dir = os.path.abspath(hint)
-    if not os.path.exists(parent_dir):
+    try:
         os.makedirs(parent_dir)
+    except OSError as ex:
+        # it's fine when it exists already. (checking it before the creation
+        # would race with other runs, which are creating the same directory.)
+        if ex.errno != errno.EEXIST or not os.path.isdir(parent_dir):
+            raise
     name = tempfile.mkdtemp(prefix=stamp, dir=parent_dir)
 
     logging.info('Report directory created: %s', name)
@@ -244,7 +296,7 @@ def report_directory(hint, keep):
     try:
         yield name
     finally:
-        if os.listdir(name):
+        if not is_empty_directory(name):
             msg = "Run 'scan-view %s' to examine bug reports."
             keep = True
         else:
@@ -258,13 +310,40 @@ def report_directory(hint, keep):
             os.rmdir(name)
 
 
+def is_empty_directory(path):
+    # type: (str) -> bool
+    """ Check the directory has no entries, without listing all of them.
+
+    The report directory might contain thousands of files, but it's enough
+    to read the first entry to decide. """
+
+    # python 2.7 and 3.4 has no scandir method
+    if not hasattr(os, 'scandir'):
+        return not os.listdir(path)
+
+    entries = os.scandir(path)
+    try:
+        return next(entries, None) is None
+    finally:
+        # python 3.5 has no close method, it's closed when garbage collected
+        if hasattr(entries, 'close'):
+            entries.close()
+
+
 def require(required):
     """ Decorator for checking the required values in state.
 
     It checks the required attributes in the passed state and stop when
-    any of those is missing. """
+    any of those is missing.
+
+    The checks are assertions, which are removed in optimized mode (python
+    -O). Then the method is returned as it is, to not pay for the extra call
+    on every analyzer step. """
 
     def decorator(method):
+        if not __debug__:
+            return method
+
         @functools.wraps(method)
         def wrapper(*args, **kwargs):
             for key in required:
@@ -312,6 +391,9 @@ def logging_analyzer_output(opts):
     # type: (Dict[str, Any]) -> None
     """ Display error message from analyzer. """
 
+    # skip the whole output, when it would not be shown anyway
+    if not logging.getLogger().isEnabledFor(logging.INFO):
+        return
     if opts and 'error_output' in opts:
         for line in opts['error_output']:
             logging.info(line)
@@ -19,17 +19,25 @@ __all__ = ['get_version', 'get_arguments', 'get_checkers']
 # regex for activated checker
 ACTIVE_CHECKER_PATTERN = re.compile(r'^-analyzer-checker=(.*)$')
 
+# already queried compiler versions (keys are the compiler names)
+VERSIONS = dict()  # type: Dict[str, str]
+
 
 def get_version(clang):
     # type: (str) -> str
     """ Returns the compiler version as string.
 
+    The compiler is executed only once per process, the result is reused
+    on later calls. (Failure reports are asking it for every failed file.)
+
     :param clang:   the compiler we are using
     :return:        the version string printed to stderr """
 
-    output = run_command([clang, '-v'])
-    # the relevant version info is in the first line
-    return output[0]
+    if clang not in VERSIONS:
+        output = run_command([clang, '-v'])
+        # the relevant version info is in the first line
+        VERSIONS[clang] = output[0]
+    return VERSIONS[clang]
 
 
 def get_arguments(command, cwd):
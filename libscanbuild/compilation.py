@@ -12,9 +12,9 @@ import logging
 import json
 import subprocess
 from typing import List, Iterable, Dict, Tuple, Type, Any  # noqa: ignore=F401
-from typing import Optional  # noqa: ignore=F401
+from typing import Optional, Set  # noqa: ignore=F401
 
-from libscanbuild import Execution, shell_split, run_command
+from libscanbuild import Execution, shell_split, run_command, load_json
 
 
 __all__ = ['classify_source', 'Compilation', 'CompilationDatabase']
@@ -111,7 +111,8 @@ class Compilation:
 
     def __hash__(self):
         # type: (Compilation) -> int
-        return hash(str(self.as_dict()))
+        return hash((self.compiler, tuple(self.flags), self.source,
+                     self.directory))
 
     def __eq__(self, other):
         # type: (Compilation, object) -> bool
@@ -297,15 +298,65 @@ class CompilationDatabase:
         # type: (str) -> Iterable[Compilation]
         """ Load compilations from file.
 
+        Duplicate entries are dropped. (Build systems might compile the same
+        module multiple times, which would run the analyzer multiple times.)
+
         :param filename: the file to read from
-        :returns: iterator of Compilation objects. """
+        :returns: iterator of unique Compilation objects. """
 
-        with open(filename, 'r') as handle:
-            for entry in json.load(handle):
-                for compilation in Compilation.from_db_entry(entry):
+        state = set()  # type: Set[Compilation]
+        for compilations in parse_db_entries(load_json(filename)):
+            for compilation in compilations:
+                if compilation not in state:
+                    state.add(compilation)
                     yield compilation
 
 
+# Compilation databases with less entries than this are parsed by the current
+# process. (Starting the worker processes would take longer than parsing.)
+PARALLEL_PARSE_THRESHOLD = 1000
+
+
+def parse_db_entries(entries):
+    # type: (List[Dict[str, Any]]) -> Iterable[List[Compilation]]
+    """ Parse compilation database entries into compilations.
+
+    Parsing the compiler invocations (splitting the command string and
+    classifying the arguments) is slow, therefore big compilation databases
+    are parsed by a process pool. The order of the entries is kept.
+
+    :param entries: the compilation database entries
+    :return: stream of compilation lists (one list for each entry) """
+
+    import multiprocessing
+
+    processes = multiprocessing.cpu_count()
+    if processes < 2 or len(entries) < PARALLEL_PARSE_THRESHOLD:
+        for entry in entries:
+            yield parse_db_entry(entry)
+        return
+
+    chunk_size = max(1, len(entries) // (4 * processes))
+    pool = multiprocessing.Pool(processes)
+    try:
+        for compilations in pool.imap(parse_db_entry, entries, chunk_size):
+            yield compilations
+        pool.close()
+    except BaseException:
+        pool.terminate()
+        raise
+    finally:
+        pool.join()
+
+
+def parse_db_entry(entry):
+    # type: (Dict[str, Any]) -> List[Compilation]
+    """ Parse a single compilation database entry. (The result is a list,
+    because generators can't be sent between processes.) """
+
+    return list(Compilation.from_db_entry(entry))
+
+
 def classify_source(filename, c_compiler=True):
     # type: (str, bool) -> Optional[str]
     """ Classify source file names and returns the presumed language,
@@ -16,21 +16,27 @@ import shutil
 import plistlib
 import glob
 import itertools
-import json
 import logging
 import datetime
 import getpass
 import socket
 import argparse  # noqa: ignore=F401
 from typing import Dict, List, Tuple, Any, Set, Generator, Iterator, Optional  # noqa: ignore=F401
+from libscanbuild import iter_json_array
 from libscanbuild.clang import get_version
+from libscanbuild.compilation import Compilation  # noqa: ignore=F401
 
 __all__ = ['document']
 
 
-def document(args):
-    # type: (argparse.Namespace) -> int
-    """ Generates cover report and returns the number of bugs/crashes. """
+def document(args, compilations=None):
+    # type: (argparse.Namespace, Optional[List[Compilation]]) -> int
+    """ Generates cover report and returns the number of bugs/crashes.
+
+    :param args: the parsed and validated command line arguments
+    :param compilations: the already loaded compilation database entries,
+    when those are available. (Saves parsing the compilation database again.)
+    :return: the number of bugs and crashes found. """
 
     html_reports_available = args.output_format in {'html', 'plist-html'}
 
@@ -46,7 +52,12 @@ def document(args):
 
         logging.debug('generate index.html file')
         # common prefix for source files to have sorter path
-        prefix = commonprefix_from(args.cdb) if use_cdb else os.getcwd()
+        if compilations is not None:
+            prefix = commonprefix(entry.source for entry in compilations)
+        elif use_cdb:
+            prefix = commonprefix_from(args.cdb)
+        else:
+            prefix = os.getcwd()
         # assemble the cover from multiple fragments
         fragments = []
         try:
@@ -537,8 +548,7 @@ def commonprefix_from(filename):
     # type: (str) -> str
     """ Create file prefix from a compilation database entries. """
 
-    with open(filename, 'r') as handle:
-        return commonprefix(item['file'] for item in json.load(handle))
+    return commonprefix(item['file'] for item in iter_json_array(filename))
 
 
 def commonprefix(files):
@@ -547,15 +557,12 @@ def commonprefix(files):
 
     :param files: list of file names.
     :return: the longest path prefix that is a prefix of all files. """
-    result = None
-    for current in files:
-        if result is not None:
-            result = os.path.commonprefix([result, current])
-        else:
-            result = current
-
-    if result is None:
+    names = list(files)
+    if not names:
         return ''
-    elif not os.path.isdir(result):
+    # the common prefix of the lexicographically smallest and largest names
+    # is the common prefix of all names. (no need to compare each of them.)
+    result = os.path.commonprefix([min(names), max(names)])
+    if not os.path.isdir(result):
         return os.path.dirname(result)
     return os.path.abspath(result)
@@ -337,3 +337,17 @@ class ReportDirectoryTest(unittest.TestCase):
              sut.report_directory(tmp_dir, False) as report_dir3:
             self.assertLess(report_dir1, report_dir2)
             self.assertLess(report_dir2, report_dir3)
+
+    def test_parent_directory_created(self):
+        with libear.temporary_directory() as tmp_dir:
+            parent_dir = os.path.join(tmp_dir, 'not', 'yet', 'exists')
+            with sut.report_directory(parent_dir, True) as report_dir:
+                self.assertEqual(parent_dir, os.path.dirname(report_dir))
+            self.assertTrue(os.path.isdir(report_dir))
+
+    def test_is_empty_directory(self):
+        with libear.temporary_directory() as tmp_dir:
+            self.assertTrue(sut.is_empty_directory(tmp_dir))
+            with open(os.path.join(tmp_dir, 'report.html'), 'w') as handle:
+                handle.write('<html/>')
+            self.assertFalse(sut.is_empty_directory(tmp_dir))
@@ -4,8 +4,11 @@
 # This file is distributed under the University of Illinois Open Source
 # License. See LICENSE.TXT for details.
 
+import libear
 import libscanbuild.compilation as sut
 import unittest
+import json
+import os.path
 
 
 class CompilerTest(unittest.TestCase):
@@ -209,3 +212,68 @@ class SourceClassifierTest(unittest.TestCase):
         self.assert_c_source('../path/file.c', True)
         self.assert_c_source('/file.c', True)
         self.assert_c_source('./file.c', True)
+
+
+class CompilationTest(unittest.TestCase):
+
+    def test_equal_compilations_have_same_hash(self):
+        one = sut.Compilation('c', ['-O2'], 'a.c', '/tmp')
+        two = sut.Compilation('c', ['-O2'], '/tmp/a.c', '/tmp/')
+        self.assertEqual(one, two)
+        self.assertEqual(hash(one), hash(two))
+        self.assertEqual(1, len({one, two}))
+
+    def test_different_compilations_are_not_equal(self):
+        one = sut.Compilation('c', ['-O2'], 'a.c', '/tmp')
+        other_flags = sut.Compilation('c', ['-O3'], 'a.c', '/tmp')
+        other_compiler = sut.Compilation('c++', ['-O2'], 'a.c', '/tmp')
+        other_source = sut.Compilation('c', ['-O2'], 'b.c', '/tmp')
+        self.assertNotEqual(one, other_flags)
+        self.assertNotEqual(one, other_compiler)
+        self.assertNotEqual(one, other_source)
+        self.assertEqual(4, len({one, other_flags, other_compiler,
+                                 other_source}))
+
+
+class CompilationDatabaseTest(unittest.TestCase):
+
+    def test_load_drops_duplicates(self):
+        with libear.temporary_directory() as tmp_dir:
+            for source in ['a.c', 'b.c']:
+                with open(os.path.join(tmp_dir, source), 'w') as handle:
+                    handle.write('int main() { return 0; }')
+            entries = [
+                {'directory': tmp_dir, 'file': 'a.c',
+                 'command': 'cc -c a.c'},
+                {'directory': tmp_dir, 'file': 'a.c',
+                 'arguments': ['cc', '-c', 'a.c']},
+                {'directory': tmp_dir, 'file': 'b.c',
+                 'command': 'cc -c b.c'},
+                {'directory': tmp_dir, 'file': 'a.c',
+                 'command': 'cc -c -DNDEBUG a.c'}
+            ]
+            cdb = os.path.join(tmp_dir, 'compile_commands.json')
+            with open(cdb, 'w') as handle:
+                json.dump(entries, handle)
+
+            result = list(sut.CompilationDatabase.load(cdb))
+            self.assertEqual(3, len(result))
+            self.assertEqual(3, len(set(result)))
+
+    def test_load_big_database_keeps_order(self):
+        with libear.temporary_directory() as tmp_dir:
+            source = os.path.join(tmp_dir, 'a.c')
+            with open(source, 'w') as handle:
+                handle.write('int main() { return 0; }')
+            count = sut.PARALLEL_PARSE_THRESHOLD + 10
+            entries = [{'directory': tmp_dir, 'file': 'a.c',
+                        'command': 'cc -c -DV={0} a.c'.format(index)}
+                       for index in range(count)]
+            cdb = os.path.join(tmp_dir, 'compile_commands.json')
+            with open(cdb, 'w') as handle:
+                json.dump(entries, handle)
+
+            result = list(sut.CompilationDatabase.load(cdb))
+            self.assertEqual(['-DV={0}'.format(index)
+                              for index in range(count)],
+                             [entry.flags[0] for entry in result])
@@ -4,8 +4,11 @@
 # This file is distributed under the University of Illinois Open Source
 # License. See LICENSE.TXT for details.
 
+import libear
 import libscanbuild as sut
 import unittest
+import json
+import os.path
 
 
 class ShellSplitTest(unittest.TestCase):
@@ -32,3 +35,23 @@ class ShellSplitTest(unittest.TestCase):
                          sut.shell_split(r'clang -c file.c -Dv=\"quote'))
         self.assertEqual(['clang', '-c', 'file.c', '-Dv=(word)'],
                          sut.shell_split(r'clang -c file.c -Dv=\(word\)'))
+
+
+class LoadJsonTest(unittest.TestCase):
+
+    def test_load_json(self):
+        content = [{'directory': '/tmp', 'file': 'a.c', 'command': 'cc a.c'}]
+        with libear.temporary_directory() as tmp_dir:
+            filename = os.path.join(tmp_dir, 'compile_commands.json')
+            with open(filename, 'w') as handle:
+                json.dump(content, handle)
+            self.assertEqual(content, sut.load_json(filename))
+
+    def test_iter_json_array(self):
+        content = [{'directory': '/tmp', 'file': 'a.c', 'command': 'cc a.c'},
+                   {'directory': '/tmp', 'file': 'b.c', 'command': 'cc b.c'}]
+        with libear.temporary_directory() as tmp_dir:
+            filename = os.path.join(tmp_dir, 'compile_commands.json')
+            with open(filename, 'w') as handle:
+                json.dump(content, handle)
+            self.assertEqual(content, list(sut.iter_json_array(filename)))
@@ -146,6 +146,15 @@ class GetPrefixFromCompilationDatabaseTest(unittest.TestCase):
         self.assertEqual(
             sut.commonprefix(['/tmp/abs/a.c', '/usr/ack/b.c']), '/')
 
+    @unittest.skipIf(IS_WINDOWS, 'windows has different path patterns')
+    def test_with_many_files(self):
+        self.assertEqual(
+            sut.commonprefix(['/tmp/abs/b.c', '/tmp/abs/a.c',
+                              '/tmp/ack/c.c', '/tmp/abs/d/e.c']), '/tmp')
+        self.assertEqual(
+            sut.commonprefix(iter(['/tmp/abs/b.c', '/tmp/abs/a.c'])),
+            '/tmp/abs')
+
     @unittest.skipIf(IS_WINDOWS, 'windows has different path patterns')
     def test_with_single_file(self):
         self.assertEqual(